@@ -1,7 +1,38 @@
 import tkinter as tk
-import copy
+from collections import deque
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional; fall back to np.maximum.
+    numba = None
+
+if numba is not None:
+    # The explicit signature compiles eagerly at import time (and is cached
+    # on disk), so the first Next Step click is not delayed by the JIT.
+    @numba.njit("int32[:,:](int32[:,:], int32[:,:])", cache=True)
+    def _merge(current, received):
+        """
+        Element-wise maximum of two 3x3 int32 matrices, written into current.
+        """
+        for i in range(3):
+            for j in range(3):
+                if received[i, j] > current[i, j]:
+                    current[i, j] = received[i, j]
+        return current
+else:
+    def _merge(current, received):
+        """
+        Element-wise maximum of two 3x3 int32 matrices, written into current.
+        """
+        return np.maximum(current, received, out=current)
 
 class SupplyChainMatrixSimulator:
+    # Map warehouse to index: W1 -> 0, W2 -> 1, W3 -> 2.
+    _WH_INDEX = {"W1": 0, "W2": 1, "W3": 2}
+    # Maximum number of log entries kept per warehouse.
+    _MAX_LOG_ENTRIES = 500
+
     def __init__(self, master):
         """
         Initialize the distributed supply chain simulation.
@@ -51,25 +82,26 @@ class SupplyChainMatrixSimulator:
     def reset_simulation(self):
         """
         Reset the simulation state:
-        - All warehouses start with a 3x3 matrix clock initialized to zeros.
-        - Clear the log for each warehouse.
+        - All warehouses start with a 3x3 matrix clock initialized to zeros,
+          stored together as a single (3, 3, 3) integer array.
+        - Clear the log for each warehouse (capped at _MAX_LOG_ENTRIES entries).
         - Reset the simulation event counter.
         - Predefine a sequence of events.
         """
         self.current_event = 0  # Event counter
 
         # Define initial 3x3 matrix clocks for each warehouse.
-        self.matrix_clocks = {
-            'W1': [[0, 0, 0] for _ in range(3)],
-            'W2': [[0, 0, 0] for _ in range(3)],
-            'W3': [[0, 0, 0] for _ in range(3)]
-        }
+        self.matrix_clocks = np.zeros((3, 3, 3), dtype=np.int32)
         # Clear logs.
         self.logs = {
-            'W1': [],
-            'W2': [],
-            'W3': []
+            'W1': deque(maxlen=self._MAX_LOG_ENTRIES),
+            'W2': deque(maxlen=self._MAX_LOG_ENTRIES),
+            'W3': deque(maxlen=self._MAX_LOG_ENTRIES)
         }
+        # Track what is currently rendered so update_ui only redraws changes.
+        self._last_clock_repr = {'W1': None, 'W2': None, 'W3': None}
+        for wh in ['W1', 'W2', 'W3']:
+            self.log_texts[wh].delete("1.0", tk.END)
         # Define a predetermined sequence of events.
         # Each event is a dictionary with type ("send" or "deliver"),
         # sender, receiver, and message text.
@@ -84,12 +116,23 @@ class SupplyChainMatrixSimulator:
             {"type": "send", "sender": "W3", "receivers": ["W1"], "message": "Shipment delivered to W3"},
             {"type": "deliver", "sender": "W3", "receiver": "W1", "message": "Shipment delivered to W3"}
         ]
+        # Give each send event an id and its sender's clock index, and link
+        # each deliver event to its send so delivery can read the attached
+        # matrix without searching.
+        sends = {}
+        for i, event in enumerate(self.events):
+            if event["type"] == "send":
+                event["id"] = i
+                event["sender_idx"] = self._WH_INDEX[event["sender"]]
+                sends[(event["sender"], event["message"])] = event
+            elif event["type"] == "deliver":
+                event["send_ref"] = sends[(event["sender"], event["message"])]
         self.update_ui()
         self.next_button.config(state=tk.NORMAL)
 
     def matrix_to_string(self, matrix):
         """
-        Convert a 3x3 matrix (list of lists) to a multi-line string.
+        Convert a 3x3 matrix (NumPy array) to a multi-line string.
         
         Args:
             matrix: The matrix clock.
@@ -97,35 +140,53 @@ class SupplyChainMatrixSimulator:
         Returns:
             A string representation of the matrix.
         """
-        return "\n".join(str(row) for row in matrix)
+        return np.array2string(matrix, separator=", ")
 
     def update_ui(self):
         """
-        Update each warehouse's clock display and log text area.
+        Update each warehouse's clock display.
+        Only clocks that changed are re-rendered; log text areas are written
+        directly by append_log.
         """
         for wh in ['W1', 'W2', 'W3']:
-            self.clock_labels[wh].config(text="Matrix Clock:\n" + self.matrix_to_string(self.matrix_clocks[wh]))
-            self.log_texts[wh].delete("1.0", tk.END)
-            for entry in self.logs[wh]:
-                self.log_texts[wh].insert(tk.END, entry + "\n")
+            clock_repr = self.matrix_to_string(self.matrix_clocks[self._WH_INDEX[wh]])
+            if clock_repr != self._last_clock_repr[wh]:
+                self.clock_labels[wh].config(text="Matrix Clock:\n" + clock_repr)
+                self._last_clock_repr[wh] = clock_repr
+
+    def append_log(self, wh, entry):
+        """
+        Append an entry to a warehouse's log and its text area.
+        Once the log is full, the oldest entry is dropped from both.
+        
+        Args:
+            wh: The warehouse whose log is updated (e.g. "W1").
+            entry: The log line to append.
+        """
+        log = self.logs[wh]
+        text = self.log_texts[wh]
+        if len(log) == log.maxlen:
+            # Remove the oldest entry's lines from the top of the text area.
+            oldest_lines = log[0].count("\n") + 1
+            text.delete("1.0", f"{oldest_lines + 1}.0")
+        log.append(entry)
+        text.insert(tk.END, entry + "\n")
+        text.see(tk.END)
 
     def merge_matrices(self, current, received):
         """
-        Merge two 3x3 matrices by taking the element-wise maximum of corresponding rows.
+        Merge two 3x3 matrices by taking the element-wise maximum, in place.
         
         Args:
-            current: The receiver's current matrix clock.
+            current: The receiver's current matrix clock (updated in place).
             received: The matrix clock attached to the received message.
             
         Returns:
-            A new merged matrix.
+            The merged matrix (the same array as current).
         """
-        merged = []
-        for i in range(3):
-            merged.append([max(a, b) for a, b in zip(current[i], received[i])])
-        return merged
+        return _merge(current, received)
 
-    def send_message(self, sender, receivers, message_text):
+    def send_message(self, sender, sender_idx, receivers, message_text):
         """
         Process a send event:
         - The sender increments its own counter in its principle row.
@@ -134,20 +195,19 @@ class SupplyChainMatrixSimulator:
         
         Args:
             sender: The sending warehouse (e.g. "W1").
+            sender_idx: The sender's index into the matrix clocks (e.g. 0 for "W1").
             receivers: List of intended recipient(s).
             message_text: The update message.
             
         Returns:
-            A deep copy of the sender's matrix clock to be attached to the message.
+            A copy of the sender's matrix clock to be attached to the message.
         """
-        # Map warehouse to index: W1 -> 0, W2 -> 1, W3 -> 2.
-        index = {"W1": 0, "W2": 1, "W3": 2}[sender]
         # Increment sender's own counter in its principle row.
-        self.matrix_clocks[sender][index][index] += 1
+        self.matrix_clocks[sender_idx, sender_idx, sender_idx] += 1
         # Copy the updated matrix to attach with the message.
-        msg_matrix = copy.deepcopy(self.matrix_clocks[sender])
+        msg_matrix = self.matrix_clocks[sender_idx].copy()
         # Log the send event.
-        self.logs[sender].append(f"Sent: {message_text} (ts: {self.matrix_to_string(msg_matrix)})")
+        self.append_log(sender, f"Sent: {message_text} (ts: {self.matrix_to_string(msg_matrix)})")
         return msg_matrix
 
     def deliver_message(self, receiver, sender, msg_matrix, message_text):
@@ -163,9 +223,9 @@ class SupplyChainMatrixSimulator:
             message_text: The update message.
         """
         # Merge the receiver's matrix with the received matrix.
-        self.matrix_clocks[receiver] = self.merge_matrices(self.matrix_clocks[receiver], msg_matrix)
+        self.merge_matrices(self.matrix_clocks[self._WH_INDEX[receiver]], msg_matrix)
         # Log the delivery event.
-        self.logs[receiver].append(f"Received from {sender}: {message_text} (ts: {self.matrix_to_string(msg_matrix)})")
+        self.append_log(receiver, f"Received from {sender}: {message_text} (ts: {self.matrix_to_string(msg_matrix)})")
 
     def next_step(self):
         """
@@ -178,8 +238,8 @@ class SupplyChainMatrixSimulator:
                 sender = event["sender"]
                 receivers = event["receivers"]
                 message_text = event["message"]
-                # Update sender's matrix clock and attach a deep copy.
-                msg_matrix = self.send_message(sender, receivers, message_text)
+                # Update sender's matrix clock and attach a copy.
+                msg_matrix = self.send_message(sender, event["sender_idx"], receivers, message_text)
                 # Save the attached matrix for later delivery.
                 event["matrix"] = msg_matrix
             elif event["type"] == "deliver":
@@ -187,12 +247,8 @@ class SupplyChainMatrixSimulator:
                 sender = event["sender"]
                 receiver = event["receiver"]
                 message_text = event["message"]
-                # Look back for the corresponding send event to get the message matrix.
-                msg_matrix = None
-                for e in self.events[:self.current_event]:
-                    if e.get("type") == "send" and e["sender"] == sender and e["message"] == message_text:
-                        msg_matrix = e.get("matrix")
-                        break
+                # Get the message matrix from the linked send event.
+                msg_matrix = event["send_ref"].get("matrix")
                 if msg_matrix is not None:
                     self.deliver_message(receiver, sender, msg_matrix, message_text)
             self.current_event += 1